@@ -0,0 +1,306 @@
+#!/usr/bin/env python
+"""Headless HTTP/JSON API for card serving and answer submission.
+
+Usage:
+    python api.py --port 8502
+
+Runs alongside the Streamlit UI and shares its decks and .progress files.
+Endpoints (all JSON unless noted):
+
+    GET  /api/decks                                  deck names
+    GET  /api/decks/<deck>                           all cards in a deck
+    GET  /api/decks/<deck>/next?learner=&category=&n=1
+    POST /api/decks/<deck>/answer                    one answer
+    POST /api/decks/<deck>/answers                   a batch of answers
+    GET  /api/decks/<deck>/stats?learner=
+    GET  /api/decks/<deck>/cards/<id>/audio          audio/mpeg bytes
+
+Score and streak are kept by the client and passed in with each answer, the
+same way app.py keeps them in session state. Decks and progress are cached in
+process; progress is written through to disk on every submission (one write
+per batch).
+"""
+import argparse
+import json
+import math
+import random
+
+import tornado.ioloop
+import tornado.web
+
+import helpers
+
+ANSWER_FIELDS = ("english", "translit", "tamil")
+MAX_BATCH = 100
+
+
+# --- In-process caches --------------------------------------------------------
+class DeckCache:
+    """Loaded decks keyed by name, reloaded when the CSV changes on disk."""
+
+    def __init__(self):
+        self._decks = {}
+
+    def get(self, deck_name: str) -> dict:
+        """Returns the cached deck; raises FileNotFoundError for unknown decks."""
+        path = helpers.DECKS_DIR / f"{deck_name}.csv"
+        mtime = path.stat().st_mtime_ns
+        entry = self._decks.get(deck_name)
+        if entry is None or entry["mtime"] != mtime:
+            df = helpers.load_deck(deck_name)
+            cards = [card_to_json(deck_name, r) for r in df.to_dict("records")]
+            entry = {
+                "mtime": mtime,
+                "df": df,
+                "cards": cards,
+                "by_id": {c["id"]: c for c in cards},
+            }
+            self._decks[deck_name] = entry
+        return entry
+
+
+class ProgressCache:
+    """Progress dicts keyed by (learner, deck), written through on save.
+
+    A cached dict is re-read only if its file changed behind our back, e.g.
+    because the same learner answered a card in the Streamlit app.
+    """
+
+    def __init__(self):
+        self._progress = {}
+
+    @staticmethod
+    def _mtime(learner: str, deck_name: str):
+        try:
+            return helpers.progress_path(learner, deck_name).stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def get(self, learner: str, deck_name: str) -> dict:
+        key = (learner, deck_name)
+        mtime = self._mtime(learner, deck_name)
+        entry = self._progress.get(key)
+        if entry is None or entry["mtime"] != mtime:
+            entry = {"mtime": mtime, "data": helpers.load_progress(learner, deck_name)}
+            self._progress[key] = entry
+        return entry["data"]
+
+    def save(self, learner: str, deck_name: str):
+        entry = self._progress[(learner, deck_name)]
+        helpers.save_progress(learner, deck_name, entry["data"])
+        entry["mtime"] = self._mtime(learner, deck_name)
+
+
+def card_to_json(deck_name: str, row: dict) -> dict:
+    card = {k: row.get(k) for k in ("id", "category", "tamil", "translit", "english", "image")}
+    # Empty CSV cells come back as NaN, which json.dumps writes as invalid JSON.
+    for k, v in card.items():
+        if isinstance(v, float) and math.isnan(v):
+            card[k] = None
+    card["id"] = int(card["id"])
+    card["audio"] = f"/api/decks/{deck_name}/cards/{card['id']}/audio"
+    return card
+
+
+def check_answer(card: dict, answer: str, field: str) -> bool:
+    """Grades a free-text answer the same way the app's pages do."""
+    if card[field] is None:
+        return False
+    if field == "tamil":
+        return (answer or "").strip() == str(card["tamil"]).strip()
+    return helpers.normalize(answer) == helpers.normalize(str(card[field]))
+
+
+# --- Handlers -----------------------------------------------------------------
+class BaseHandler(tornado.web.RequestHandler):
+
+    def initialize(self, decks: DeckCache, progress: ProgressCache):
+        self.decks = decks
+        self.progress = progress
+
+    def set_default_headers(self):
+        self.set_header("Content-Type", "application/json; charset=UTF-8")
+
+    def write_error(self, status_code, **kwargs):
+        message = self._reason
+        if "exc_info" in kwargs and isinstance(kwargs["exc_info"][1], tornado.web.HTTPError):
+            message = kwargs["exc_info"][1].log_message or message
+        self.finish({"error": message})
+
+    def deck(self, deck_name: str) -> dict:
+        # The URL pattern already restricts names to [A-Za-z0-9_-], so a stat
+        # of data/decks/<name>.csv is enough to validate it.
+        try:
+            return self.decks.get(deck_name)
+        except FileNotFoundError:
+            raise tornado.web.HTTPError(404, f"unknown deck: {deck_name}")
+
+    def learner(self) -> str:
+        return self.get_argument("learner", "You")
+
+    def json_body(self) -> dict:
+        try:
+            body = json.loads(self.request.body or b"{}")
+        except ValueError:
+            raise tornado.web.HTTPError(400, "body is not valid JSON")
+        if not isinstance(body, dict):
+            raise tornado.web.HTTPError(400, "body must be a JSON object")
+        return body
+
+    def write_json(self, data):
+        self.finish(json.dumps(data, ensure_ascii=False))
+
+
+class DecksHandler(BaseHandler):
+    def get(self):
+        self.write_json({"decks": helpers.list_decks()})
+
+
+class DeckHandler(BaseHandler):
+    def get(self, deck_name):
+        self.write_json({"deck": deck_name, "cards": self.deck(deck_name)["cards"]})
+
+
+class NextCardHandler(BaseHandler):
+    def get(self, deck_name):
+        entry = self.deck(deck_name)
+        progress = self.progress.get(self.learner(), deck_name)
+        category = self.get_argument("category", None)
+        try:
+            n = max(1, min(int(self.get_argument("n", "1")), MAX_BATCH))
+        except ValueError:
+            raise tornado.web.HTTPError(400, "'n' must be an integer")
+
+        df = entry["df"]
+        if category:
+            df = df[df["category"] == category]
+        due_ids = helpers.due_cards(df, progress)["id"].tolist()
+        # Like the app, fall back to the whole pool when nothing is due.
+        pick_from = due_ids or df["id"].tolist()
+        ids = random.sample(pick_from, min(n, len(pick_from)))
+        self.write_json({
+            "deck": deck_name,
+            "due": len(due_ids),
+            "cards": [entry["by_id"][i] for i in ids],
+        })
+
+
+class AnswerHandler(BaseHandler):
+    """Applies one answer (`/answer`) or a batch (`/answers`) and saves once."""
+
+    def grade(self, entry: dict, ans) -> tuple:
+        if not isinstance(ans, dict):
+            raise tornado.web.HTTPError(400, "each answer must be a JSON object")
+        try:
+            card = entry["by_id"].get(int(ans.get("card_id")))
+        except (TypeError, ValueError):
+            card = None
+        if card is None:
+            raise tornado.web.HTTPError(404, f"unknown card: {ans.get('card_id')}")
+        if "correct" in ans:
+            correct = bool(ans["correct"])
+        else:
+            field = ans.get("field", "english")
+            if field not in ANSWER_FIELDS:
+                raise tornado.web.HTTPError(400, f"'field' must be one of {', '.join(ANSWER_FIELDS)}")
+            answer = ans.get("answer", "")
+            if not isinstance(answer, str):
+                raise tornado.web.HTTPError(400, "'answer' must be a string")
+            correct = check_answer(card, answer, field)
+        return card, correct, bool(ans.get("hard_mode", False))
+
+    def post(self, deck_name, batch=None):
+        entry = self.deck(deck_name)
+        body = self.json_body()
+        learner = str(body.get("learner", "You"))
+        progress = self.progress.get(learner, deck_name)
+        try:
+            score = int(body.get("score", 0))
+            streak = int(body.get("streak", 0))
+        except (TypeError, ValueError):
+            raise tornado.web.HTTPError(400, "'score' and 'streak' must be integers")
+
+        answers = body.get("answers") if batch else [body]
+        if not isinstance(answers, list) or not 0 < len(answers) <= MAX_BATCH:
+            raise tornado.web.HTTPError(400, f"'answers' must be a list of 1..{MAX_BATCH} answers")
+
+        # Grade everything first so a bad entry rejects the batch untouched.
+        graded = [self.grade(entry, ans) for ans in answers]
+
+        results = []
+        for card, correct, hard_mode in graded:
+            score, streak = helpers.update_card_progress(
+                progress, card["id"], correct, hard_mode=hard_mode,
+                current_score=score, current_streak=streak
+            )
+            state = helpers.get_card_state(progress, card["id"])
+            results.append({"card_id": card["id"], "correct": correct, "box": state["box"], "due": state["due"]})
+        self.progress.save(learner, deck_name)
+
+        result = {"score": score, "streak": streak, "level": helpers.calculate_level(score)}
+        if batch:
+            result["results"] = results
+        else:
+            result.update(results[0])
+        self.write_json(result)
+
+
+class StatsHandler(BaseHandler):
+    def get(self, deck_name):
+        entry = self.deck(deck_name)
+        progress = self.progress.get(self.learner(), deck_name)
+        boxes = {str(i): 0 for i in range(1, 6)}
+        for cid in entry["by_id"]:
+            boxes[str(helpers.get_card_state(progress, cid)["box"])] += 1
+        self.write_json({
+            "deck": deck_name,
+            "cards": len(entry["cards"]),
+            "due": len(helpers.due_cards(entry["df"], progress)),
+            "boxes": boxes,
+        })
+
+
+class AudioHandler(BaseHandler):
+    async def get(self, deck_name, card_id):
+        card = self.deck(deck_name)["by_id"].get(int(card_id))
+        if card is None:
+            raise tornado.web.HTTPError(404, f"unknown card: {card_id}")
+        # gTTS does a network round trip on a cache miss; keep it off the loop.
+        mp3 = await tornado.ioloop.IOLoop.current().run_in_executor(
+            None, helpers.tts_file, deck_name, card["id"], card["tamil"]
+        )
+        if not mp3.exists():
+            raise tornado.web.HTTPError(404, "audio not available")
+        self.set_header("Content-Type", "audio/mpeg")
+        self.set_header("Cache-Control", "public, max-age=86400")
+        self.finish(mp3.read_bytes())
+
+
+def make_app(decks: DeckCache = None, progress: ProgressCache = None) -> tornado.web.Application:
+    deps = {"decks": decks or DeckCache(), "progress": progress or ProgressCache()}
+    deck = r"/api/decks/([A-Za-z0-9_-]+)"
+    return tornado.web.Application([
+        (r"/api/decks", DecksHandler, deps),
+        (deck, DeckHandler, deps),
+        (deck + r"/next", NextCardHandler, deps),
+        (deck + r"/answer", AnswerHandler, deps),
+        (deck + r"/(answers)", AnswerHandler, deps),
+        (deck + r"/stats", StatsHandler, deps),
+        (deck + r"/cards/([0-9]+)/audio", AudioHandler, deps),
+    ])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the Tamil Buddy HTTP/JSON API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    args = parser.parse_args(argv)
+
+    helpers.init_directories()
+    make_app().listen(args.port, address=args.host)
+    print(f"Tamil Buddy API on http://{args.host}:{args.port}/api/decks")
+    tornado.ioloop.IOLoop.current().start()
+
+
+if __name__ == "__main__":
+    main()
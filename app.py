@@ -1,9 +1,14 @@
+import json
 import random
 import pandas as pd
 import streamlit as st
 from pathlib import Path
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 
+import assets
+import distractors
 import helpers
+import memstats
 import ui
 
 # --- Session State -----------------------------------------------------------
@@ -38,6 +43,21 @@ class SessionState:
         if SessionState.STREAK not in st.session_state:
             st.session_state[SessionState.STREAK] = 0
 
+# --- Shared Data ---------------------------------------------------------------
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _shared_deck(deck_name: str, mtime_ns: int):
+    deck = helpers.load_deck(deck_name)
+    cards = {int(r["id"]): r for r in deck.to_dict("records")}
+    memstats.record_shared(f"deck:{deck_name}", deck)
+    memstats.record_shared(f"cards:{deck_name}", cards)
+    return deck, cards
+
+def shared_deck(deck_name: str):
+    """Returns (DataFrame, {id: row dict}) for a deck, shared by every session.
+    Treat both as read-only; they are reloaded when the CSV changes."""
+    mtime_ns = (helpers.DECKS_DIR / f"{deck_name}.csv").stat().st_mtime_ns
+    return _shared_deck(deck_name, mtime_ns)
+
 # --- Main App -----------------------------------------------------------------
 st.set_page_config(
     page_title="Tamil Buddy",
@@ -56,6 +76,8 @@ st.markdown("""
 
 helpers.init_directories()
 SessionState.init()
+if memstats.enabled():
+    memstats.start_tracing()
 
 # --- Sidebar -----------------------------------------------------------------
 st.sidebar.title("Tamil Buddy")
@@ -87,10 +109,13 @@ if deck_name != st.session_state[SessionState.DECK_NAME]:
     st.session_state[SessionState.DECK_NAME] = deck_name
     st.session_state[SessionState.CARD_INDEX] = 0
 
+pages = ["Home", "Quiz", "Type (Translit)", "Type (Tamil KB)", "Alphabet", "Browse Cards", "Progress", "About"]
+if memstats.enabled():
+    pages.append("Diagnostics")
 page = st.sidebar.radio(
     "Go to",
-    ["Home", "Quiz", "Type (Translit)", "Type (Tamil KB)", "Alphabet", "Browse Cards", "Progress", "About"],
-    index=["Home", "Quiz", "Type (Translit)", "Type (Tamil KB)", "Alphabet", "Browse Cards", "Progress", "About"].index(st.session_state[SessionState.PAGE])
+    pages,
+    index=pages.index(st.session_state[SessionState.PAGE]) if st.session_state[SessionState.PAGE] in pages else 0
 )
 if page != st.session_state[SessionState.PAGE]:
     st.session_state[SessionState.PAGE] = page
@@ -121,7 +146,7 @@ elif page == "Browse Cards":
     total_cards_count = 0
 
     for deck_name_item in all_decks:
-        deck_df = helpers.load_deck(deck_name_item)
+        deck_df, _ = shared_deck(deck_name_item)
         total_cards_count += len(deck_df)
         st.subheader(f"Deck: {deck_name_item.replace('_', ' ').title()}")
         
@@ -129,24 +154,34 @@ elif page == "Browse Cards":
         for category, group in deck_df.groupby("category"):
             st.markdown(f"#### Category: {category.title()}")
             for index, row in group.iterrows():
-                st.markdown(f"**{row['tamil']}** ({row['translit']}) - {row['english']}")
+                thumb = assets.thumbnail_path(row.get("image"))
+                if thumb:
+                    c1, c2 = st.columns([1, 5])
+                    c1.image(str(thumb), width=64)
+                    c2.markdown(f"**{row['tamil']}** ({row['translit']}) - {row['english']}")
+                else:
+                    st.markdown(f"**{row['tamil']}** ({row['translit']}) - {row['english']}")
             st.markdown("--- ")
     st.markdown(f"### Total Flashcards: {total_cards_count}")
 
 
 
 elif page == "Quiz":
-    deck = helpers.load_deck(deck_name)
+    deck, cards = shared_deck(deck_name)
+    distractor_table = distractors.table_for(deck_name, deck)
     progress = helpers.load_progress(learner, deck_name)
     st.header(f"Quiz — Multiple Choice ({deck_name})")
 
-    # Initialize quiz state
-    if 'quiz_question' not in st.session_state:
-        st.session_state.quiz_question = None
-    if 'quiz_options' not in st.session_state:
-        st.session_state.quiz_options = []
-    if 'quiz_correct_answer' not in st.session_state:
-        st.session_state.quiz_correct_answer = None
+    # Initialize quiz state. Only card ids and flags are kept per session;
+    # the text is looked up in the shared deck on every rerun.
+    if 'quiz_card_id' not in st.session_state:
+        st.session_state.quiz_card_id = None
+    if 'quiz_source' not in st.session_state:
+        st.session_state.quiz_source = None
+    if 'quiz_option_ids' not in st.session_state:
+        st.session_state.quiz_option_ids = ()
+    if 'quiz_reverse' not in st.session_state:
+        st.session_state.quiz_reverse = False
     if 'quiz_user_answer' not in st.session_state:
         st.session_state.quiz_user_answer = None
     if 'quiz_answer_submitted' not in st.session_state:
@@ -159,31 +194,46 @@ elif page == "Quiz":
         categories = ["All"] + sorted(deck["category"].unique().tolist())
         cat = st.selectbox("Category", categories, index=0)
 
-    pool = deck.copy() if cat == "All" else deck[deck["category"] == cat].copy()
+    pool_ids = deck["id"].tolist() if cat == "All" else deck.loc[deck["category"] == cat, "id"].tolist()
 
-    if pool.empty:
+    if not pool_ids:
         st.info("No cards in this category.")
     else:
-        # Load a new question if one isn't already loaded
-        if st.session_state.quiz_question is None:
-            qrow = pool.sample(1, random_state=random.randint(0, 9999)).iloc[0]
-            if direction == "Tamil → English":
-                st.session_state.quiz_question = f"{qrow['tamil']} ({qrow['translit']})"
-                st.session_state.quiz_correct_answer = qrow['english']
-                options = [st.session_state.quiz_correct_answer] + pool[pool['id'] != qrow['id']].sample(min(3, len(pool)-1))['english'].tolist()
-            else:  # English → Tamil
-                st.session_state.quiz_question = qrow['english']
-                st.session_state.quiz_correct_answer = f"{qrow['tamil']} ({qrow['translit']})"
-                other_choices = pool[pool['id'] != qrow['id']].sample(min(3, len(pool)-1))
-                options = [st.session_state.quiz_correct_answer] + [f"{row['tamil']} ({row['translit']})" for _, row in other_choices.iterrows()]
-            
-            random.shuffle(options)
-            st.session_state.quiz_options = options
-            st.session_state.qrow = qrow
-
-        st.markdown(f"<h3 style='font-size: 30px;'>{st.session_state.quiz_question}</h3>", unsafe_allow_html=True)
-        
-        qrow = st.session_state.qrow
+        # Load a new question if none is loaded, if it came from another deck or
+        # category (ids restart at 1 in every deck, so they can't tell), or if
+        # the deck was edited and its cards are gone.
+        question_ids = (st.session_state.quiz_card_id,) + tuple(st.session_state.quiz_option_ids)
+        if st.session_state.quiz_source != (deck_name, cat) or any(i not in cards for i in question_ids):
+            # A new question must not inherit the old answer or radio choice.
+            st.session_state.quiz_user_answer = None
+            st.session_state.quiz_answer_submitted = False
+            st.session_state.pop(f"quiz_radio_{st.session_state[SessionState.CARD_INDEX]}", None)
+            card_id = random.choice(pool_ids)
+            option_ids = [card_id] + distractors.pick(
+                distractor_table, card_id, k=min(3, len(pool_ids)-1),
+                pool_ids=None if cat == "All" else set(pool_ids)
+            )
+            random.shuffle(option_ids)
+            st.session_state.quiz_card_id = card_id
+            st.session_state.quiz_source = (deck_name, cat)
+            st.session_state.quiz_option_ids = tuple(option_ids)
+            st.session_state.quiz_reverse = direction == "English → Tamil"
+
+        qrow = cards[st.session_state.quiz_card_id]
+        if st.session_state.quiz_reverse:  # English → Tamil
+            question = qrow['english']
+            option_label = lambda cid: f"{cards[cid]['tamil']} ({cards[cid]['translit']})"
+        else:
+            question = f"{qrow['tamil']} ({qrow['translit']})"
+            option_label = lambda cid: cards[cid]['english']
+        correct_answer = option_label(st.session_state.quiz_card_id)
+
+        st.markdown(f"<h3 style='font-size: 30px;'>{question}</h3>", unsafe_allow_html=True)
+
+        thumb = assets.thumbnail_path(qrow.get("image"))
+        if thumb:
+            st.image(str(thumb), width=160)
+
         with st.spinner("Generating Tamil audio..."):
             mp3 = helpers.tts_file(deck_name, int(qrow["id"]), qrow["tamil"])
         if mp3.exists():
@@ -191,7 +241,7 @@ elif page == "Quiz":
         elif not helpers.GTTS_AVAILABLE:
             st.caption("Install gTTS for audio: `pip install gTTS` (requires internet).")
 
-        user_answer = st.radio("Pick one:", st.session_state.quiz_options, index=None, key=f"quiz_radio_{st.session_state[SessionState.CARD_INDEX]}")
+        user_answer = st.radio("Pick one:", st.session_state.quiz_option_ids, format_func=option_label, index=None, key=f"quiz_radio_{st.session_state[SessionState.CARD_INDEX]}")
 
         if not st.session_state.quiz_answer_submitted:
             if st.button("Submit", key=f"submit_quiz_{st.session_state[SessionState.CARD_INDEX]}"):
@@ -199,11 +249,11 @@ elif page == "Quiz":
                 st.session_state.quiz_answer_submitted = True
                 st.rerun()
         else:
-            is_correct = (st.session_state.quiz_user_answer == st.session_state.quiz_correct_answer)
+            is_correct = (st.session_state.quiz_user_answer == st.session_state.quiz_card_id)
             if is_correct:
                 st.success("Correct!")
             else:
-                st.error(f"Not quite. Correct answer: {st.session_state.quiz_correct_answer}")
+                st.error(f"Not quite. Correct answer: {correct_answer}")
 
             st.session_state[SessionState.SCORE], st.session_state[SessionState.STREAK] = helpers.update_card_progress(
                 progress, int(qrow["id"]), is_correct,
@@ -215,16 +265,15 @@ elif page == "Quiz":
 
             if st.button("Next Question", key=f"next_quiz_{st.session_state[SessionState.CARD_INDEX]}"):
                 # Reset quiz state for the next question
-                st.session_state.quiz_question = None
-                st.session_state.quiz_options = []
-                st.session_state.quiz_correct_answer = None
+                st.session_state.quiz_card_id = None
+                st.session_state.quiz_option_ids = ()
                 st.session_state.quiz_user_answer = None
                 st.session_state.quiz_answer_submitted = False
                 st.session_state[SessionState.CARD_INDEX] += 1
                 st.rerun()
 
 elif page == "Type (Translit)":
-    deck = helpers.load_deck(deck_name)
+    deck, _ = shared_deck(deck_name)
     progress = helpers.load_progress(learner, deck_name)
     st.header(f"Type — Transliteration ({deck_name})")
     st.write("Type the **transliteration** (Latin letters) for the Tamil text shown.")
@@ -251,7 +300,7 @@ elif page == "Type (Translit)":
         helpers.save_progress(learner, deck_name, progress)
 
 elif page == "Type (Tamil KB)":
-    deck = helpers.load_deck(deck_name)
+    deck, _ = shared_deck(deck_name)
     progress = helpers.load_progress(learner, deck_name)
     st.header(f"Type — Tamil Keyboard ({deck_name})")
     st.write("Use the on‑screen keyboard to type the **Tamil** for the English prompt.")
@@ -281,7 +330,7 @@ elif page == "Type (Tamil KB)":
         helpers.save_progress(learner, deck_name, progress)
 
 elif page == "Progress":
-    deck = helpers.load_deck(deck_name)
+    deck, _ = shared_deck(deck_name)
     progress = helpers.load_progress(learner, deck_name)
     st.header(f"Progress ({deck_name})")
 
@@ -322,4 +371,41 @@ elif page == "About":
 **Tamil Buddy** (v2) adds audio, keyboard, and multiple decks.  
 - Add CSVs to **data/decks/** (columns: `id,category,tamil,translit,english`).  
 - Use **scripts/prompts/topic_to_json.md** with **Gemini CLI** to grow decks.  
-""")
\ No newline at end of file
+""")
+
+elif page == "Diagnostics":
+    st.header("Diagnostics — Memory")
+    rep = memstats.report()
+    fmt = lambda n: f"{n / 1024 / 1024:.1f} MB" if n >= 1024 * 1024 else f"{n / 1024:.1f} KB"
+
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("Process RSS", fmt(rep["rss_bytes"]))
+    c2.metric("Shared decks", fmt(rep["shared_bytes"]))
+    c3.metric("Sessions", rep["sessions"])
+    c4.metric("Avg session", fmt(rep["session_bytes_avg"]))
+
+    st.subheader("Sessions")
+    st.dataframe(pd.DataFrame([
+        {"session": sid[:8], "learner": e["label"], "bytes": e["bytes"],
+         "largest key": max(e["keys"], key=e["keys"].get, default="")}
+        for sid, e in rep["per_session"].items()
+    ]), hide_index=True)
+
+    st.subheader("Capacity estimate")
+    n = st.number_input("Concurrent learners", min_value=1, value=50, step=10)
+    st.markdown(f"Estimated RSS for **{n}** learners: **{fmt(memstats.estimate_rss(rep, n))}** "
+                "(current process minus session state, plus the average session per learner).")
+
+    if rep["tracemalloc"]:
+        st.subheader("Top allocations (tracemalloc)")
+        st.caption(f"Traced: {fmt(rep['tracemalloc']['current_bytes'])} now, {fmt(rep['tracemalloc']['peak_bytes'])} peak")
+        st.dataframe(pd.DataFrame(rep["tracemalloc"]["top"]), hide_index=True)
+
+    st.download_button("Download report JSON", data=json.dumps(rep, indent=2),
+                       file_name="tamil_buddy_memory.json", mime="application/json")
+
+# --- Memory accounting ---------------------------------------------------------
+if memstats.enabled():
+    ctx = get_script_run_ctx()
+    memstats.record_session(ctx.session_id if ctx else "local", st.session_state.to_dict(),
+                            label=st.session_state[SessionState.LEARNER])
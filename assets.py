@@ -0,0 +1,261 @@
+#!/usr/bin/env python
+"""Local thumbnail cache for the deck `image` column.
+
+Usage:
+    python assets.py                 # prefetch images for every deck
+    python assets.py core food       # only these decks
+    python assets.py --workers 4
+
+Each referenced image is fetched once, resized to a fixed-size thumbnail and
+stored content-addressed under .assets/thumbs/<xx>/<sha256>.jpg. The index in
+.assets/index.json maps the source URL to its thumbnail and is rewritten after
+every image, so an interrupted run resumes where it left off. The app only
+ever serves thumbnails from disk; it never hotlinks the remote URL.
+"""
+import argparse
+import base64
+import csv
+import hashlib
+import io
+import json
+import os
+import sys
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+try:
+    from PIL import Image, ImageOps
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+# --- Constants ----------------------------------------------------------------
+PROJECT_ROOT = Path(__file__).parent.resolve()
+DECKS_DIR = PROJECT_ROOT / "data" / "decks"
+ASSETS_DIR = PROJECT_ROOT / ".assets"
+THUMBS_DIR = ASSETS_DIR / "thumbs"
+INDEX_PATH = ASSETS_DIR / "index.json"
+
+THUMB_SIZE = (256, 256)
+FETCH_TIMEOUT = 10
+MAX_IMAGE_BYTES = 5 * 1024 * 1024
+USER_AGENT = "TamilBuddy-assets/1.0"
+
+
+# --- Fetchers -----------------------------------------------------------------
+def fetch_url(url: str) -> bytes:
+    """Default fetcher: http(s) URLs, data: URIs and file: URLs."""
+    if url.startswith("data:"):
+        header, _, payload = url.partition(",")
+        if header.endswith(";base64"):
+            data = base64.b64decode(payload)
+        else:
+            data = urllib.parse.unquote_to_bytes(payload)
+    else:
+        request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+        with urllib.request.urlopen(request, timeout=FETCH_TIMEOUT) as resp:
+            data = resp.read(MAX_IMAGE_BYTES + 1)
+    if len(data) > MAX_IMAGE_BYTES:
+        raise ValueError(f"image larger than {MAX_IMAGE_BYTES} bytes")
+    return data
+
+
+def directory_fetcher(root):
+    """Returns a fetcher that imports images from a local directory instead of
+    the network. Files are looked up by `url_key(url)` with any extension,
+    which is the layout a manual download or a test fixture can produce."""
+    root = Path(root)
+
+    def fetch(url: str) -> bytes:
+        matches = sorted(root.glob(f"{url_key(url)}.*"))
+        if not matches:
+            raise FileNotFoundError(f"no local image for {url[:60]}")
+        return matches[0].read_bytes()
+
+    return fetch
+
+
+# --- Index --------------------------------------------------------------------
+def url_key(url: str) -> str:
+    """Stable short key for a source URL (data: URIs can be kilobytes long)."""
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+def load_index(path: Path = None) -> dict:
+    path = path or INDEX_PATH
+    try:
+        index = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {"size": list(THUMB_SIZE), "images": {}, "failed": {}}
+    index.setdefault("images", {})
+    index.setdefault("failed", {})
+    return index
+
+
+def save_index(index: dict, path: Path = None):
+    """Writes the index atomically so a crash never leaves it half-written."""
+    path = path or INDEX_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(index, ensure_ascii=False, indent=1), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+# --- Thumbnails ---------------------------------------------------------------
+def make_thumbnail(data: bytes, size=THUMB_SIZE) -> bytes:
+    """Center-crops and resizes image bytes to a fixed-size JPEG."""
+    with Image.open(io.BytesIO(data)) as im:
+        im = ImageOps.exif_transpose(im)
+        if im.mode in ("RGBA", "LA", "P"):
+            im = im.convert("RGBA")
+            background = Image.new("RGB", im.size, "white")
+            background.paste(im, mask=im.getchannel("A"))
+            im = background
+        else:
+            im = im.convert("RGB")
+        thumb = ImageOps.fit(im, tuple(size), Image.LANCZOS)
+        out = io.BytesIO()
+        thumb.save(out, format="JPEG", quality=85, optimize=True)
+    return out.getvalue()
+
+
+def store_thumbnail(thumb: bytes, thumbs_dir: Path = None) -> str:
+    """Stores thumbnail bytes by content hash and returns the path relative to
+    the thumbs directory. Identical images are only stored once."""
+    thumbs_dir = thumbs_dir or THUMBS_DIR
+    digest = hashlib.sha256(thumb).hexdigest()
+    rel = f"{digest[:2]}/{digest}.jpg"
+    dest = thumbs_dir / rel
+    if not dest.exists():
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_suffix(".tmp")
+        tmp.write_bytes(thumb)
+        os.replace(tmp, dest)
+    return rel
+
+
+def _process(url: str, fetcher, size, thumbs_dir: Path) -> str:
+    return store_thumbnail(make_thumbnail(fetcher(url), size), thumbs_dir)
+
+
+# --- Pipeline -----------------------------------------------------------------
+def deck_image_urls(deck_names=None, decks_dir: Path = None) -> list:
+    """Returns the unique image references used by the given decks, in order."""
+    decks_dir = decks_dir or DECKS_DIR
+    if deck_names is None:
+        paths = sorted(decks_dir.glob("*.csv"))
+    else:
+        paths = [decks_dir / f"{name}.csv" for name in deck_names]
+    urls = []
+    seen = set()
+    for p in paths:
+        with open(p, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                url = (row.get("image") or "").strip()
+                if url and url not in seen:
+                    seen.add(url)
+                    urls.append(url)
+    return urls
+
+
+def prefetch(urls, fetcher=fetch_url, workers: int = 8, size=THUMB_SIZE,
+             assets_dir: Path = None, retry_failed: bool = True, progress=None) -> dict:
+    """Fetches and thumbnails every URL not already in the index.
+
+    At most `workers` fetches are in flight at once. The index is saved after
+    each completed image, so re-running after an interruption only processes
+    what is left. Returns counts of done/skipped/failed images.
+    """
+    if not PIL_AVAILABLE:
+        raise RuntimeError("Pillow is required to build thumbnails: pip install Pillow")
+
+    assets_dir = Path(assets_dir) if assets_dir else ASSETS_DIR
+    index_path = assets_dir / "index.json"
+    thumbs_dir = assets_dir / "thumbs"
+    index = load_index(index_path)
+    if index.get("size") != list(size):
+        # Thumbnails of a different size are useless; start the index over.
+        index = {"size": list(size), "images": {}, "failed": {}}
+
+    urls = list(dict.fromkeys(urls))
+    todo = []
+    for url in urls:
+        key = url_key(url)
+        if key in index["images"] and (thumbs_dir / index["images"][key]).exists():
+            continue
+        if key in index["failed"] and not retry_failed:
+            continue
+        todo.append((key, url))
+
+    stats = {"done": 0, "skipped": len(urls) - len(todo), "failed": 0}
+    if not todo:
+        return stats
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(_process, url, fetcher, size, thumbs_dir): (key, url) for key, url in todo}
+        for future in as_completed(futures):
+            key, url = futures[future]
+            try:
+                index["images"][key] = future.result()
+                index["failed"].pop(key, None)
+                stats["done"] += 1
+            except Exception as e:
+                index["failed"][key] = f"{type(e).__name__}: {e}"[:200]
+                stats["failed"] += 1
+            save_index(index, index_path)
+            if progress:
+                progress(stats)
+    return stats
+
+
+# --- Lookup (used by the app) ---------------------------------------------------
+_index_cache = {"mtime": None, "images": {}}
+
+
+def thumbnail_path(url, assets_dir: Path = None):
+    """Returns the local thumbnail Path for an image reference, or None if it
+    has not been prefetched. The index is re-read only when it changes."""
+    if not isinstance(url, str) or not url.strip():
+        return None
+    assets_dir = Path(assets_dir) if assets_dir else ASSETS_DIR
+    index_path = assets_dir / "index.json"
+    try:
+        mtime = (str(index_path), index_path.stat().st_mtime_ns)
+    except OSError:
+        return None
+    if _index_cache["mtime"] != mtime:
+        _index_cache["images"] = load_index(index_path)["images"]
+        _index_cache["mtime"] = mtime
+    rel = _index_cache["images"].get(url_key(url.strip()))
+    if rel is None:
+        return None
+    path = assets_dir / "thumbs" / rel
+    return path if path.exists() else None
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Prefetch deck images into the local thumbnail cache.")
+    parser.add_argument("decks", nargs="*", help="deck names (default: all decks)")
+    parser.add_argument("--workers", type=int, default=8, help="concurrent downloads (default: 8)")
+    parser.add_argument("--size", type=int, default=THUMB_SIZE[0], help="thumbnail edge in pixels")
+    parser.add_argument("--from-dir", help="import images from this directory instead of downloading")
+    parser.add_argument("--skip-failed", action="store_true", help="do not retry images that failed before")
+    args = parser.parse_args(argv)
+
+    urls = deck_image_urls(args.decks or None)
+    fetcher = directory_fetcher(args.from_dir) if args.from_dir else fetch_url
+
+    def report(stats):
+        print(f"\r{stats['done']} fetched, {stats['failed']} failed", end="", file=sys.stderr)
+
+    stats = prefetch(urls, fetcher=fetcher, workers=args.workers, size=(args.size, args.size),
+                     retry_failed=not args.skip_failed, progress=report)
+    print(f"\n{len(urls)} images: {stats['done']} fetched, {stats['skipped']} already cached, "
+          f"{stats['failed']} failed", file=sys.stderr)
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,347 @@
+#!/usr/bin/env python
+"""Deck validation and linting for the CSVs in data/decks.
+
+Usage:
+    python deck_lint.py                    # lint every deck, text report
+    python deck_lint.py --format json      # machine-readable report
+    python deck_lint.py --fast data/decks/food.csv   # pre-commit mode
+
+Per-deck checks run in a process pool and are cached by file hash in
+.lint_cache.json, so only decks that changed since the last run are
+re-checked. Cross-deck checks (duplicate phrases, category drift) run on
+the cached per-deck summaries afterwards.
+"""
+import argparse
+import csv
+import difflib
+import hashlib
+import json
+import os
+import re
+import sys
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# --- Constants ----------------------------------------------------------------
+PROJECT_ROOT = Path(__file__).parent.resolve()
+DECKS_DIR = PROJECT_ROOT / "data" / "decks"
+LINT_CACHE_PATH = PROJECT_ROOT / ".lint_cache.json"
+
+# Bump whenever a rule changes so stale cache entries are re-checked.
+RULES_VERSION = 2
+
+REQUIRED_COLUMNS = ["id", "category", "tamil", "translit", "english"]
+OPTIONAL_COLUMNS = ["image"]
+
+ERROR = "error"
+WARNING = "warning"
+
+CATEGORY_RE = re.compile(r"^[a-z][a-z0-9_]*$")
+# Tamil dependent vowel signs (and virama) that must follow a consonant.
+TAMIL_SIGNS = set("ாிீுூெேைொோௌ்")
+
+
+def _is_tamil(ch: str) -> bool:
+    return "\u0b80" <= ch <= "\u0bff"
+
+
+def _is_tamil_consonant(ch: str) -> bool:
+    return "\u0b95" <= ch <= "\u0bb9"
+
+
+def phrase_key(text: str) -> str:
+    """Normalizes a phrase for duplicate detection (whitespace, case, punctuation)."""
+    text = unicodedata.normalize("NFC", text or "")
+    text = "".join(c for c in text if not unicodedata.category(c).startswith("P"))
+    return " ".join(text.lower().split())
+
+
+def _issue(deck: str, line: int, card_id, rule: str, severity: str, message: str) -> dict:
+    return {
+        "deck": deck,
+        "line": line,
+        "id": card_id,
+        "rule": rule,
+        "severity": severity,
+        "message": message,
+    }
+
+
+# --- Per-deck checks ----------------------------------------------------------
+def check_tamil(text: str) -> list:
+    """Returns (rule, severity, message) tuples for problems in a Tamil field."""
+    problems = []
+    # Decomposed input splits vowel signs like "ொ" into two, the second of
+    # which would then look like a sign without a consonant.
+    text = unicodedata.normalize("NFC", text)
+    if not any(_is_tamil(c) for c in text):
+        problems.append(("tamil-script", ERROR, "no Tamil script in 'tamil'"))
+        return problems
+
+    foreign = sorted({c for c in text if unicodedata.category(c).startswith("L") and not _is_tamil(c)})
+    if foreign:
+        problems.append(("tamil-script", WARNING, f"non-Tamil letters in 'tamil': {''.join(foreign)}"))
+
+    # A vowel sign with no consonant before it is the usual symptom of text
+    # pasted from a legacy-font PDF (e.g. "ெசய்து" instead of "செய்து").
+    for prev, ch in zip(" " + text, text):
+        if ch in TAMIL_SIGNS and not _is_tamil_consonant(prev):
+            problems.append(("tamil-malformed", WARNING, f"vowel sign '{ch}' without a base consonant"))
+            break
+    return problems
+
+
+def check_translit(text: str) -> list:
+    """Returns (rule, severity, message) tuples for problems in a transliteration."""
+    problems = []
+    if any(_is_tamil(c) for c in text):
+        problems.append(("translit-script", ERROR, "Tamil script in 'translit'"))
+    elif any(unicodedata.category(c).startswith("L") and not c.isascii() for c in text):
+        problems.append(("translit-ascii", WARNING, "diacritics in 'translit' (keep it plain ASCII)"))
+    return problems
+
+
+def check_image(value: str) -> list:
+    """Returns (rule, severity, message) tuples for problems in an image reference."""
+    if not value:
+        return [("image-missing", WARNING, "empty 'image'")]
+    if not value.startswith(("http://", "https://", "data:image/")):
+        return [("image-invalid", ERROR, f"unsupported image reference: {value[:40]}")]
+    return []
+
+
+def lint_deck_file(path) -> dict:
+    """Lints a single deck CSV.
+
+    Returns a picklable summary with the issues found plus the phrase and
+    category data the cross-deck pass needs, so it can be cached as is.
+    """
+    path = Path(path)
+    deck = path.stem
+    issues = []
+    phrases = []
+    categories = {}
+
+    try:
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            columns = reader.fieldnames or []
+            missing = [c for c in REQUIRED_COLUMNS if c not in columns]
+            if missing:
+                issues.append(_issue(deck, 1, None, "columns", ERROR, f"missing columns: {', '.join(missing)}"))
+                return {"deck": deck, "issues": issues, "phrases": phrases, "categories": categories}
+            unknown = [c for c in columns if c not in REQUIRED_COLUMNS + OPTIONAL_COLUMNS]
+            if unknown:
+                issues.append(_issue(deck, 1, None, "columns", WARNING, f"unknown columns: {', '.join(unknown)}"))
+            has_image = "image" in columns
+
+            seen_ids = {}
+            seen_phrases = {}
+            for row in reader:
+                line = reader.line_num
+                if None in row:
+                    issues.append(_issue(deck, line, row.get("id"), "row-shape", ERROR, "too many fields (unquoted comma?)"))
+                    continue
+                row = {k: (v or "").strip() for k, v in row.items()}
+
+                try:
+                    card_id = int(row["id"])
+                except ValueError:
+                    issues.append(_issue(deck, line, row["id"] or None, "id", ERROR, f"id is not an integer: {row['id']!r}"))
+                    continue
+                if card_id in seen_ids:
+                    issues.append(_issue(deck, line, card_id, "id-duplicate", ERROR, f"duplicate id (first on line {seen_ids[card_id]})"))
+                else:
+                    seen_ids[card_id] = line
+
+                def add(problems):
+                    issues.extend(_issue(deck, line, card_id, *p) for p in problems)
+
+                for field in ["category", "tamil", "translit", "english"]:
+                    if not row[field]:
+                        add([(f"{field}-empty", ERROR, f"empty '{field}'")])
+
+                if row["category"]:
+                    categories[row["category"]] = categories.get(row["category"], 0) + 1
+                    if not CATEGORY_RE.match(row["category"]):
+                        add([("category-format", WARNING, f"category {row['category']!r} is not snake_case")])
+                if row["tamil"]:
+                    add(check_tamil(row["tamil"]))
+                    key = phrase_key(row["tamil"])
+                    if key in seen_phrases:
+                        add([("phrase-duplicate", WARNING, f"same Tamil phrase as id {seen_phrases[key]}")])
+                    else:
+                        seen_phrases[key] = card_id
+                        phrases.append([key, card_id])
+                if row["translit"]:
+                    add(check_translit(row["translit"]))
+                if has_image:
+                    add(check_image(row["image"]))
+                else:
+                    add([("image-missing", WARNING, "no 'image' column")])
+    except (OSError, UnicodeDecodeError, csv.Error) as e:
+        issues.append(_issue(deck, 0, None, "read", ERROR, f"cannot read deck: {e}"))
+
+    return {"deck": deck, "issues": issues, "phrases": phrases, "categories": categories}
+
+
+# --- Cross-deck checks --------------------------------------------------------
+def cross_deck_issues(results: list) -> list:
+    """Finds phrases repeated across decks and categories that drift from known names."""
+    issues = []
+
+    owners = {}
+    for res in results:
+        for key, card_id in res["phrases"]:
+            owners.setdefault(key, []).append((res["deck"], card_id))
+    for key, where in sorted(owners.items()):
+        if len({deck for deck, _ in where}) > 1:
+            places = ", ".join(f"{deck}#{cid}" for deck, cid in where)
+            for deck, cid in where:
+                issues.append(_issue(deck, 0, cid, "phrase-cross-duplicate", WARNING, f"phrase also in other decks: {places}"))
+
+    # A category used only a handful of times that closely resembles a deck
+    # name or a more common category is most likely a typo or abbreviation.
+    counts = {}
+    for res in results:
+        for cat, n in res["categories"].items():
+            counts[cat] = counts.get(cat, 0) + n
+    known = {res["deck"] for res in results} | {c for c, n in counts.items() if n >= 5}
+    for res in results:
+        for cat in res["categories"]:
+            if cat in known:
+                continue
+            candidates = [k for k in sorted(known) if len(cat) >= 3 and k.startswith(cat) and k[len(cat)] != "_"]
+            candidates += difflib.get_close_matches(cat, sorted(known), n=1, cutoff=0.9)
+            if candidates:
+                issues.append(_issue(res["deck"], 0, None, "category-drift", WARNING, f"category {cat!r} looks like {candidates[0]!r}"))
+    return issues
+
+
+# --- Cache --------------------------------------------------------------------
+def file_hash(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def load_cache(path: Path = None) -> dict:
+    path = path or LINT_CACHE_PATH
+    try:
+        cache = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if cache.get("rules_version") != RULES_VERSION:
+        return {}
+    return cache.get("decks", {})
+
+
+def save_cache(entries: dict, path: Path = None):
+    """Writes the cache atomically so an interrupted run never truncates it."""
+    path = path or LINT_CACHE_PATH
+    payload = {"rules_version": RULES_VERSION, "decks": entries}
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+# --- Engine -------------------------------------------------------------------
+def lint_decks(paths=None, jobs: int = None, fast: bool = False, use_cache: bool = True, cache_path: Path = None) -> dict:
+    """Lints decks and returns a report dict.
+
+    Unchanged decks (same sha256 and rules version) are served from the
+    cache. Changed decks are checked in a process pool unless `fast` is set
+    or there is only one to check, where the pool start-up would dominate.
+    `fast` also skips the cross-deck pass, which needs every deck.
+    Linting every deck also drops cache entries for decks that are gone.
+    """
+    all_decks = paths is None
+    if all_decks:
+        paths = sorted(DECKS_DIR.glob("*.csv"))
+    paths = [Path(p) for p in paths]
+
+    cache = load_cache(cache_path) if use_cache else {}
+    pruned = False
+    if all_decks:
+        live = {str(p.resolve()) for p in paths}
+        pruned = not live.issuperset(cache)
+        cache = {k: v for k, v in cache.items() if k in live}
+    results = {}
+    stale = []
+    for p in paths:
+        digest = file_hash(p)
+        entry = cache.get(str(p.resolve()))
+        if entry and entry["sha256"] == digest:
+            results[p] = entry["result"]
+        else:
+            stale.append((p, digest))
+
+    if fast or jobs == 1 or len(stale) <= 1:
+        fresh = [lint_deck_file(p) for p, _ in stale]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            fresh = list(pool.map(lint_deck_file, [p for p, _ in stale]))
+
+    for (p, digest), res in zip(stale, fresh):
+        results[p] = res
+        cache[str(p.resolve())] = {"sha256": digest, "result": res}
+    if use_cache and (stale or pruned):
+        save_cache(cache, cache_path)
+
+    ordered = [results[p] for p in paths]
+    issues = [i for res in ordered for i in res["issues"]]
+    if not fast:
+        issues += cross_deck_issues(ordered)
+
+    return {
+        "decks": len(paths),
+        "checked": len(stale),
+        "cached": len(paths) - len(stale),
+        "errors": sum(1 for i in issues if i["severity"] == ERROR),
+        "warnings": sum(1 for i in issues if i["severity"] == WARNING),
+        "issues": issues,
+    }
+
+
+def format_text(report: dict) -> str:
+    lines = []
+    for i in report["issues"]:
+        where = f"{i['deck']}.csv"
+        if i["line"]:
+            where += f":{i['line']}"
+        if i["id"] is not None:
+            where += f" (id {i['id']})"
+        lines.append(f"{where}: {i['severity']}: [{i['rule']}] {i['message']}")
+    lines.append(
+        f"{report['decks']} decks ({report['checked']} checked, {report['cached']} cached): "
+        f"{report['errors']} errors, {report['warnings']} warnings"
+    )
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Lint the deck CSVs in data/decks.")
+    parser.add_argument("paths", nargs="*", help="deck CSVs to lint (default: all decks)")
+    parser.add_argument("--format", choices=["text", "json"], default="text")
+    parser.add_argument("--fast", action="store_true", help="no process pool, no cross-deck checks (pre-commit)")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--no-cache", action="store_true", help="ignore and do not update the lint cache")
+    parser.add_argument("--strict", action="store_true", help="exit non-zero on warnings too")
+    args = parser.parse_args(argv)
+
+    paths = [p for p in args.paths if p.endswith(".csv")] or None
+    if args.paths and paths is None:
+        return 0
+    report = lint_decks(paths, jobs=args.jobs, fast=args.fast, use_cache=not args.no_cache)
+
+    if args.format == "json":
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print(format_text(report))
+
+    if report["errors"] or (args.strict and report["warnings"]):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+"""Precomputed quiz distractors.
+
+For every card in a deck we rank the other cards by how plausible they are
+as wrong answers (same category, shared English words, similar
+transliteration, similar Tamil graphemes) and keep the top NEIGHBOURS ids.
+The table is built once per deck version, cached in memory and on disk under
+.distractors/<deck>.json keyed by the CSV's sha256, so a question only has
+to slice a short list instead of filtering and sampling the whole deck.
+
+Building a table is O(n^2) in pure Python (up to half a second per deck),
+so warm the cache after editing decks rather than paying for it in the
+first Quiz rerun:
+
+    python distractors.py            # every deck
+    python distractors.py core food
+"""
+import hashlib
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import unicodedata
+
+import helpers
+
+# --- Constants ----------------------------------------------------------------
+DISTRACTORS_DIR = helpers.PROJECT_ROOT / ".distractors"
+
+# Bump whenever the scoring changes so cached tables are rebuilt.
+TABLE_VERSION = 2
+NEIGHBOURS = 12
+
+WEIGHTS = {"category": 0.3, "english": 0.25, "translit": 0.25, "tamil": 0.2}
+STOPWORDS = {"a", "an", "the", "i", "you", "is", "are", "to", "of", "my", "your", "it", "please", "do"}
+
+_tables = {}
+
+
+# --- Similarity -----------------------------------------------------------------
+def english_tokens(text: str) -> frozenset:
+    words = re.findall(r"[a-z0-9']+", str(text).lower())
+    return frozenset(w for w in words if w not in STOPWORDS) or frozenset(words)
+
+
+def tamil_graphemes(text: str) -> tuple:
+    """Splits Tamil text into grapheme clusters (base letter + vowel signs/virama)."""
+    clusters = []
+    for ch in unicodedata.normalize("NFC", str(text)):
+        if ch.isspace():
+            continue
+        if clusters and unicodedata.category(ch) in ("Mn", "Mc"):
+            clusters[-1] += ch
+        else:
+            clusters.append(ch)
+    return tuple(clusters)
+
+
+def edit_distance(a, b) -> int:
+    """Levenshtein distance between two sequences."""
+    if len(a) < len(b):
+        a, b = b, a
+    prev = list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        cur = [i]
+        for j, y in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (x != y)))
+        prev = cur
+    return prev[-1]
+
+
+def _ratio(a, b) -> float:
+    longest = max(len(a), len(b))
+    return 1.0 - edit_distance(a, b) / longest if longest else 0.0
+
+
+def _jaccard(a: frozenset, b: frozenset) -> float:
+    union = a | b
+    return len(a & b) / len(union) if union else 0.0
+
+
+def _features(row: dict) -> dict:
+    return {
+        "id": int(row["id"]),
+        "category": str(row["category"]),
+        "english": english_tokens(row["english"]),
+        "english_key": helpers.normalize(str(row["english"])),
+        "translit": helpers.normalize(str(row["translit"])).replace(" ", ""),
+        "tamil": tamil_graphemes(row["tamil"]),
+    }
+
+
+def similarity(a: dict, b: dict) -> float:
+    return (
+        WEIGHTS["category"] * (a["category"] == b["category"])
+        + WEIGHTS["english"] * _jaccard(a["english"], b["english"])
+        + WEIGHTS["translit"] * _ratio(a["translit"], b["translit"])
+        + WEIGHTS["tamil"] * _ratio(a["tamil"], b["tamil"])
+    )
+
+
+def build_table(deck, neighbours: int = NEIGHBOURS) -> dict:
+    """Returns the distractor table for a deck DataFrame:
+
+        {"near": {card_id: [neighbour ids, most similar first]},
+         "keys": {card_id: [english key, tamil key]}}
+
+    Cards with the same English or Tamil as the question are never listed,
+    since they would be a second correct answer. `keys` lets `pick` apply the
+    same rule to its fallback and to the chosen options among themselves.
+    """
+    feats = [_features(r) for r in deck.to_dict("records")]
+    near = {}
+    for a in feats:
+        scored = [
+            (similarity(a, b), b["id"]) for b in feats
+            if b["id"] != a["id"] and b["english_key"] != a["english_key"] and b["tamil"] != a["tamil"]
+        ]
+        scored.sort(key=lambda s: (-s[0], s[1]))
+        near[a["id"]] = [cid for _, cid in scored[:neighbours]]
+    keys = {f["id"]: [f["english_key"], "".join(f["tamil"])] for f in feats}
+    return {"near": near, "keys": keys}
+
+
+# --- Cache --------------------------------------------------------------------
+def deck_hash(deck_name: str) -> str:
+    return hashlib.sha256((helpers.DECKS_DIR / f"{deck_name}.csv").read_bytes()).hexdigest()
+
+
+def table_for(deck_name: str, deck=None) -> dict:
+    """Returns the distractor table for a deck, building it only if the deck
+    changed since it was last cached (in memory, then on disk)."""
+    digest = deck_hash(deck_name)
+    cached = _tables.get(deck_name)
+    if cached and cached[0] == digest:
+        return cached[1]
+
+    path = DISTRACTORS_DIR / f"{deck_name}.json"
+    table = None
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data.get("version") == TABLE_VERSION and data.get("sha256") == digest:
+            table = {part: {int(k): v for k, v in data["table"][part].items()} for part in ("near", "keys")}
+    except (OSError, json.JSONDecodeError, KeyError, ValueError):
+        pass
+
+    if table is None:
+        table = build_table(helpers.load_deck(deck_name) if deck is None else deck)
+        DISTRACTORS_DIR.mkdir(exist_ok=True)
+        payload = {"version": TABLE_VERSION, "sha256": digest, "table": table}
+        # Sessions may rebuild the same deck at once: each writes its own temp
+        # file and swaps it in, so readers never see a half-written table.
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(payload), encoding="utf-8")
+        os.replace(tmp, path)
+
+    _tables[deck_name] = (digest, table)
+    return table
+
+
+def pick(table: dict, card_id: int, k: int = 3, pool_ids=None, rng=random) -> list:
+    """Picks up to k distractor ids for a card.
+
+    Draws at random from the 2k closest neighbours (restricted to `pool_ids`
+    when the quiz is filtered to a category) so the same card does not always
+    get the same options. Falls back to the further neighbours, then to random
+    pool cards, only when that leaves fewer than k. No two options (the card included)
+    ever share an English or Tamil text, so fewer than k may be returned.
+    """
+    card_id = int(card_id)
+    keys = table["keys"]
+    used = set(keys.get(card_id, []))
+
+    def take(candidates, n):
+        chosen = []
+        for cid in rng.sample(candidates, len(candidates)):
+            if len(chosen) == n:
+                break
+            if not used.intersection(keys[cid]):
+                used.update(keys[cid])
+                chosen.append(cid)
+        return chosen
+
+    candidates = table["near"].get(card_id, [])
+    if pool_ids is not None:
+        candidates = [cid for cid in candidates if cid in pool_ids]
+    chosen = take(candidates[:2 * k], k)
+    if len(chosen) < k:
+        chosen += take(candidates[2 * k:], k - len(chosen))
+    if len(chosen) < k and pool_ids is not None:
+        rest = [cid for cid in pool_ids if cid != card_id and cid not in chosen]
+        chosen += take(rest, k - len(chosen))
+    return chosen
+
+
+def main(argv=None) -> int:
+    """Builds (or refreshes) the on-disk tables for the given decks."""
+    names = argv if argv is not None else sys.argv[1:]
+    for deck_name in names or helpers.list_decks():
+        t0 = time.perf_counter()
+        table = table_for(deck_name)
+        print(f"{deck_name}: {len(table['near'])} cards in {time.perf_counter() - t0:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
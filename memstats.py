@@ -0,0 +1,124 @@
+"""Per-session memory accounting for the Streamlit app.
+
+app.py records the deep size of every session's state at the end of each
+rerun, and registers the decks it shares between sessions. The Diagnostics
+page (enabled with TAMIL_BUDDY_DIAGNOSTICS=1) turns that into a report:
+process RSS, shared data, per-session state and, when tracemalloc is
+running, the top allocation sites. `estimate_rss` extrapolates the report
+to N concurrent learners for sizing workers.
+"""
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+# Sessions not seen for this long are assumed closed and dropped.
+SESSION_TTL = 30 * 60
+
+_lock = threading.Lock()
+_sessions = {}
+_shared = {}
+
+
+def enabled() -> bool:
+    return os.environ.get("TAMIL_BUDDY_DIAGNOSTICS", "") not in ("", "0")
+
+
+def start_tracing(frames: int = 1):
+    """Starts tracemalloc if it is not running yet (it slows allocation down,
+    so only the diagnostics switch turns it on)."""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+
+
+# --- Sizing -------------------------------------------------------------------
+def deep_sizeof(obj, seen=None) -> int:
+    """Approximate bytes held by obj and everything it references.
+
+    Objects registered as shared are not counted, so a session that refers
+    to the shared deck is charged for the reference only.
+    """
+    if seen is None:
+        with _lock:
+            seen = {entry["id"] for entry in _shared.values()}
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    if hasattr(obj, "memory_usage") and hasattr(obj, "index"):
+        # pandas DataFrame / Series
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum() if hasattr(usage, "sum") else usage)
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    return size
+
+
+def process_rss() -> int:
+    """Current resident set size in bytes (peak RSS where /proc is missing)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+# --- Registry -----------------------------------------------------------------
+def record_shared(name: str, obj):
+    """Registers an object shared by all sessions (e.g. a cached deck)."""
+    size = deep_sizeof(obj, seen=set())
+    with _lock:
+        _shared[name] = {"id": id(obj), "bytes": size}
+
+
+def record_session(session_id: str, state: dict, label: str = ""):
+    """Records the size of one session's state, broken down by key."""
+    keys = {str(k): deep_sizeof(v) for k, v in state.items()}
+    now = time.time()
+    with _lock:
+        _sessions[session_id] = {"label": label, "bytes": sum(keys.values()), "keys": keys, "seen": now}
+        for sid in [s for s, e in _sessions.items() if now - e["seen"] > SESSION_TTL]:
+            del _sessions[sid]
+
+
+def report(top: int = 15) -> dict:
+    """Returns a JSON-serialisable snapshot of memory use."""
+    with _lock:
+        sessions = {sid: dict(e) for sid, e in _sessions.items()}
+        shared = {name: e["bytes"] for name, e in _shared.items()}
+
+    session_bytes = [e["bytes"] for e in sessions.values()]
+    data = {
+        "time": time.time(),
+        "rss_bytes": process_rss(),
+        "shared_bytes": sum(shared.values()),
+        "shared": shared,
+        "sessions": len(sessions),
+        "session_bytes_total": sum(session_bytes),
+        "session_bytes_avg": sum(session_bytes) // len(session_bytes) if session_bytes else 0,
+        "session_bytes_max": max(session_bytes, default=0),
+        "per_session": sessions,
+        "tracemalloc": None,
+    }
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        stats = tracemalloc.take_snapshot().statistics("lineno")[:top]
+        data["tracemalloc"] = {
+            "current_bytes": current,
+            "peak_bytes": peak,
+            "top": [{"where": str(s.traceback[0]), "bytes": s.size, "count": s.count} for s in stats],
+        }
+    return data
+
+
+def estimate_rss(rep: dict, learners: int) -> int:
+    """Extrapolates RSS to `learners` concurrent sessions: everything that is
+    not session state is treated as fixed, plus the average session per learner."""
+    fixed = rep["rss_bytes"] - rep["session_bytes_total"]
+    return fixed + learners * rep["session_bytes_avg"]
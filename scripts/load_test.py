@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+"""Load test for api.py, with the Streamlit rerun path as a baseline.
+
+Usage:
+    python scripts/load_test.py                      # spawn api.py, 10s, 32 clients
+    python scripts/load_test.py --url http://127.0.0.1:8502 --concurrency 64
+    python scripts/load_test.py --streamlit-runs 50  # also time app.py reruns
+
+Each simulated client loops "next card" then "submit answer". The Streamlit
+baseline replays the Quiz page through streamlit.testing's AppTest, which
+executes app.py exactly like a browser interaction does (one full script
+rerun per request), so the two requests/sec numbers are comparable.
+"""
+import argparse
+import asyncio
+import json
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from tornado.httpclient import AsyncHTTPClient
+
+PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+sys.path.append(str(PROJECT_ROOT))
+import helpers
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def wait_ready(client, url: str, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            await client.fetch(f"{url}/api/decks")
+            return
+        except Exception:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+async def run_client(client, url: str, deck: str, learner: str, until: float, latencies: list, errors: list):
+    score = streak = 0
+    while time.monotonic() < until:
+        try:
+            t0 = time.perf_counter()
+            resp = await client.fetch(f"{url}/api/decks/{deck}/next?learner={learner}")
+            latencies.append(time.perf_counter() - t0)
+            card = json.loads(resp.body)["cards"][0]
+
+            body = json.dumps({"learner": learner, "card_id": card["id"], "answer": card["english"],
+                               "score": score, "streak": streak})
+            t0 = time.perf_counter()
+            resp = await client.fetch(f"{url}/api/decks/{deck}/answer", method="POST", body=body)
+            latencies.append(time.perf_counter() - t0)
+            result = json.loads(resp.body)
+            score, streak = result["score"], result["streak"]
+        except Exception as e:
+            errors.append(repr(e))
+
+
+async def load_api(url: str, deck: str, learners: list, duration: float) -> dict:
+    AsyncHTTPClient.configure(None, max_clients=len(learners))
+    client = AsyncHTTPClient()
+    await wait_ready(client, url)
+    latencies, errors = [], []
+    start = time.monotonic()
+    await asyncio.gather(*[
+        run_client(client, url, deck, name, start + duration, latencies, errors) for name in learners
+    ])
+    elapsed = time.monotonic() - start
+    return {"requests": len(latencies), "errors": len(errors), "elapsed": elapsed, "latencies": latencies}
+
+
+def load_streamlit(deck: str, runs: int) -> dict:
+    """Times full app.py reruns of the Quiz page (what every click costs)."""
+    from streamlit.testing.v1 import AppTest
+
+    sys.path.insert(0, str(PROJECT_ROOT))
+    at = AppTest.from_file(str(PROJECT_ROOT / "app.py"), default_timeout=30)
+    at.run()
+    at.sidebar.selectbox[0].set_value(deck)
+    at.sidebar.radio[0].set_value("Quiz").run()
+    latencies = []
+    start = time.monotonic()
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        at.run()
+        latencies.append(time.perf_counter() - t0)
+    return {"requests": runs, "errors": len(at.exception), "elapsed": time.monotonic() - start,
+            "latencies": latencies}
+
+
+def summary(name: str, res: dict) -> str:
+    lat = sorted(res["latencies"]) or [0.0]
+    p95 = lat[min(len(lat) - 1, int(len(lat) * 0.95))]
+    return (f"{name:<10} {res['requests'] / res['elapsed']:>9.1f} req/s  "
+            f"p50 {statistics.median(lat) * 1000:7.1f} ms  p95 {p95 * 1000:7.1f} ms  "
+            f"({res['requests']} requests, {res['errors']} errors)")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Load test the Tamil Buddy API.")
+    parser.add_argument("--url", help="running API base URL (default: spawn api.py on a free port)")
+    parser.add_argument("--deck", default="core")
+    parser.add_argument("--learner", default="loadtest")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--streamlit-runs", type=int, default=20, help="app.py reruns to time (0 to skip)")
+    args = parser.parse_args(argv)
+
+    # Spread clients over a few learners so progress writes are not all one file.
+    learners = [f"{args.learner}{i % 8}" for i in range(args.concurrency)]
+    server = None
+    url = args.url
+    if url is None:
+        port = free_port()
+        url = f"http://127.0.0.1:{port}"
+        server = subprocess.Popen([sys.executable, str(PROJECT_ROOT / "api.py"), "--port", str(port)],
+                                  stdout=subprocess.DEVNULL)
+    try:
+        api_res = asyncio.run(load_api(url, args.deck, learners, args.duration))
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+            # Do not leave the synthetic learners' progress behind.
+            for name in set(learners):
+                helpers.progress_path(name, args.deck).unlink(missing_ok=True)
+
+    print(summary("api", api_res))
+    if args.streamlit_runs:
+        st_res = load_streamlit(args.deck, args.streamlit_runs)
+        print(summary("streamlit", st_res))
+        print(f"speed-up: {(api_res['requests'] / api_res['elapsed']) / (st_res['requests'] / st_res['elapsed']):.1f}x")
+    return 1 if api_res["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+import os
+import json
+import unittest
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from tornado.testing import AsyncHTTPTestCase
+
+# This is a bit of a hack to import the api module from the parent directory
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+import api
+import helpers
+
+DECK = (
+    "id,category,tamil,translit,english,image\n"
+    "1,greetings,வணக்கம்,vanakkam,Hello,https://example.com/1.png\n"
+    "2,greetings,நன்றி,,Thank you,\n"
+    "3,food,தண்ணீர்,thanneer,Water,https://example.com/3.png\n"
+)
+
+class TestApi(AsyncHTTPTestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        (root / "decks").mkdir()
+        (root / "progress").mkdir()
+        (root / "audio").mkdir()
+        (root / "decks" / "core.csv").write_text(DECK, encoding="utf-8")
+        self.patches = [
+            patch("helpers.DECKS_DIR", root / "decks"),
+            patch("helpers.PROGRESS_DIR", root / "progress"),
+            patch("helpers.AUDIO_DIR", root / "audio"),
+            patch("helpers.GTTS_AVAILABLE", False),
+        ]
+        for p in self.patches:
+            p.start()
+        self.audio_dir = root / "audio"
+        super().setUp()
+
+    def tearDown(self):
+        super().tearDown()
+        for p in self.patches:
+            p.stop()
+        self.tmp.cleanup()
+
+    def get_app(self):
+        return api.make_app()
+
+    def get_json(self, path):
+        resp = self.fetch(path)
+        return resp.code, json.loads(resp.body)
+
+    def post_json(self, path, body):
+        resp = self.fetch(path, method="POST", body=json.dumps(body))
+        return resp.code, json.loads(resp.body)
+
+    def test_decks_and_cards(self):
+        self.assertEqual(self.get_json("/api/decks"), (200, {"decks": ["core"]}))
+        code, data = self.get_json("/api/decks/core")
+        self.assertEqual(code, 200)
+        self.assertEqual([c["id"] for c in data["cards"]], [1, 2, 3])
+        self.assertIsNone(data["cards"][1]["image"])
+        self.assertIsNone(data["cards"][1]["translit"])
+        self.assertNotIn(b"NaN", self.fetch("/api/decks/core").body)
+        self.assertEqual(self.get_json("/api/decks/nope")[0], 404)
+
+    def test_next_card(self):
+        code, data = self.get_json("/api/decks/core/next?learner=t&category=greetings&n=5")
+        self.assertEqual(code, 200)
+        self.assertEqual(data["due"], 2)
+        self.assertEqual(sorted(c["id"] for c in data["cards"]), [1, 2])
+        self.assertEqual(self.get_json("/api/decks/core/next?n=x")[0], 400)
+
+    def test_answer_updates_progress_and_stats(self):
+        code, data = self.post_json("/api/decks/core/answer", {
+            "learner": "t", "card_id": 1, "answer": " HELLO ", "field": "english", "score": 0, "streak": 0,
+        })
+        self.assertEqual(code, 200)
+        self.assertEqual((data["correct"], data["box"], data["score"], data["streak"]), (True, 2, 10, 1))
+        self.assertEqual(helpers.load_progress("t", "core")["1"]["box"], 2)
+        code, data = self.post_json("/api/decks/core/answer", {"learner": "t", "card_id": 1, "answer": 5})
+        self.assertEqual((code, data["error"]), (400, "'answer' must be a string"))
+
+        code, data = self.get_json("/api/decks/core/stats?learner=t")
+        self.assertEqual((data["cards"], data["due"]), (3, 2))
+        self.assertEqual(data["boxes"]["1"], 2)
+        self.assertEqual(data["boxes"]["2"], 1)
+
+    def test_batch_answers(self):
+        code, data = self.post_json("/api/decks/core/answers", {
+            "learner": "t", "score": 0, "streak": 0, "answers": [
+                {"card_id": 1, "correct": True},
+                {"card_id": 2, "answer": "thank you", "field": "english"},
+                {"card_id": 3, "answer": "தண்ணி", "field": "tamil"},
+            ],
+        })
+        self.assertEqual(code, 200)
+        self.assertEqual([r["correct"] for r in data["results"]], [True, True, False])
+        self.assertEqual((data["score"], data["streak"]), (12, 0))
+
+        # One bad entry rejects the whole batch.
+        code, data = self.post_json("/api/decks/core/answers", {
+            "learner": "u", "answers": [{"card_id": 1, "correct": True}, {"card_id": 99, "correct": True}],
+        })
+        self.assertEqual(code, 404)
+        self.assertEqual(helpers.load_progress("u", "core"), {})
+
+    def test_progress_reloads_after_external_write(self):
+        self.post_json("/api/decks/core/answer", {"learner": "t", "card_id": 1, "correct": True})
+        helpers.save_progress("t", "core", {})
+        path = helpers.progress_path("t", "core")
+        os.utime(path, ns=(path.stat().st_mtime_ns + 10**9,) * 2)
+        code, data = self.get_json("/api/decks/core/stats?learner=t")
+        self.assertEqual(data["boxes"]["1"], 3)
+
+    def test_audio(self):
+        self.assertEqual(self.fetch("/api/decks/core/cards/1/audio").code, 404)
+        (self.audio_dir / "core").mkdir(exist_ok=True)
+        (self.audio_dir / "core" / "1.mp3").write_bytes(b"ID3")
+        resp = self.fetch("/api/decks/core/cards/1/audio")
+        self.assertEqual(resp.code, 200)
+        self.assertEqual(resp.headers["Content-Type"], "audio/mpeg")
+        self.assertEqual(resp.body, b"ID3")
+
+if __name__ == "__main__":
+    unittest.main()
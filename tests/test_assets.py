@@ -0,0 +1,78 @@
+import io
+import base64
+import unittest
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+# This is a bit of a hack to import the assets module from the parent directory
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+import assets
+
+def png_bytes(color, size=(40, 20)):
+    out = io.BytesIO()
+    assets.Image.new("RGB", size, color).save(out, format="PNG")
+    return out.getvalue()
+
+@unittest.skipUnless(assets.PIL_AVAILABLE, "Pillow not installed")
+class TestAssets(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.images = {
+            "https://example.com/red.png": png_bytes("red"),
+            "https://example.com/blue.png": png_bytes("blue"),
+            "https://example.com/red-again.png": png_bytes("red"),
+        }
+        self.calls = []
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def fetcher(self, url):
+        self.calls.append(url)
+        return self.images[url]
+
+    def test_prefetch_builds_fixed_size_content_addressed_thumbnails(self):
+        stats = assets.prefetch(list(self.images), fetcher=self.fetcher, workers=2, size=(32, 32), assets_dir=self.dir)
+        self.assertEqual(stats, {"done": 3, "skipped": 0, "failed": 0})
+
+        red = assets.thumbnail_path("https://example.com/red.png", assets_dir=self.dir)
+        again = assets.thumbnail_path("https://example.com/red-again.png", assets_dir=self.dir)
+        blue = assets.thumbnail_path("https://example.com/blue.png", assets_dir=self.dir)
+        self.assertEqual(red, again)
+        self.assertNotEqual(red, blue)
+        with assets.Image.open(red) as im:
+            self.assertEqual(im.size, (32, 32))
+        self.assertIsNone(assets.thumbnail_path("https://example.com/unknown.png", assets_dir=self.dir))
+        self.assertIsNone(assets.thumbnail_path(float("nan"), assets_dir=self.dir))
+
+    def test_prefetch_resumes_and_retries_failures(self):
+        urls = list(self.images) + ["https://example.com/missing.png"]
+        stats = assets.prefetch(urls, fetcher=self.fetcher, size=(32, 32), assets_dir=self.dir)
+        self.assertEqual((stats["done"], stats["failed"]), (3, 1))
+
+        self.calls = []
+        self.images["https://example.com/missing.png"] = png_bytes("green")
+        stats = assets.prefetch(urls, fetcher=self.fetcher, size=(32, 32), assets_dir=self.dir)
+        self.assertEqual(stats, {"done": 1, "skipped": 3, "failed": 0})
+        self.assertEqual(self.calls, ["https://example.com/missing.png"])
+
+    def test_directory_fetcher_and_data_uri(self):
+        url = "https://example.com/local.png"
+        (self.dir / f"{assets.url_key(url)}.png").write_bytes(png_bytes("red"))
+        self.assertEqual(assets.directory_fetcher(self.dir)(url), png_bytes("red"))
+        with self.assertRaises(FileNotFoundError):
+            assets.directory_fetcher(self.dir)("https://example.com/other.png")
+
+        data_uri = "data:image/png;base64," + base64.b64encode(png_bytes("blue")).decode()
+        self.assertEqual(assets.fetch_url(data_uri), png_bytes("blue"))
+        self.assertEqual(assets.fetch_url("data:text/plain,a%20b"), b"a b")
+        with patch("assets.MAX_IMAGE_BYTES", 10):
+            with self.assertRaises(ValueError):
+                assets.fetch_url(data_uri)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+import unicodedata
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+# This is a bit of a hack to import the deck_lint module from the parent directory
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+import deck_lint
+
+HEADER = "id,category,tamil,translit,english,image\n"
+
+class TestDeckLint(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.cache = self.dir / "cache.json"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_deck(self, name, body):
+        path = self.dir / f"{name}.csv"
+        path.write_text(HEADER + body, encoding="utf-8")
+        return path
+
+    def rules(self, report):
+        return sorted({i["rule"] for i in report["issues"]})
+
+    def test_clean_deck(self):
+        path = self.write_deck("food", "1,food,தண்ணீர்,thanneer,Water,https://example.com/w.png\n")
+        report = deck_lint.lint_decks([path], cache_path=self.cache)
+        self.assertEqual(report["issues"], [])
+        self.assertEqual(report["errors"], 0)
+
+    def test_row_problems(self):
+        path = self.write_deck("food", (
+            "1,food,தண்ணீர்,thanneer,Water,https://example.com/w.png\n"
+            "1,food,water,thanneer,Water,\n"
+            "x,food,சைவம்,saivam,Vegetarian,https://example.com/v.png\n"
+            "3,food,ெசய்து,ceytu,Do,https://example.com/d.png\n"
+            "4,food,உணவு,,Food,https://example.com/f.png\n"
+        ))
+        report = deck_lint.lint_decks([path], cache_path=self.cache)
+        self.assertEqual(self.rules(report), [
+            "id", "id-duplicate", "image-missing", "tamil-malformed", "tamil-script", "translit-empty",
+        ])
+
+    def test_decomposed_tamil_is_not_malformed(self):
+        self.assertEqual(deck_lint.check_tamil(unicodedata.normalize("NFD", "கொடு")), [])
+
+    def test_cross_deck_checks(self):
+        a = self.write_deck("accommodation", "".join(
+            f"{i},accommodation,அறை {i},arai,Room,https://example.com/{i}.png\n" for i in range(1, 6)
+        ))
+        b = self.write_deck("travel", (
+            "1,accom,அறை 1,arai,Room,https://example.com/r.png\n"
+            "2,directions,இடது,idathu,Left,https://example.com/l.png\n"
+        ))
+        report = deck_lint.lint_decks([a, b], jobs=2, cache_path=self.cache)
+        self.assertEqual(self.rules(report), ["category-drift", "phrase-cross-duplicate"])
+
+        fast = deck_lint.lint_decks([a, b], fast=True, cache_path=self.cache)
+        self.assertEqual(fast["issues"], [])
+
+    def test_cache_rechecks_only_changed_decks(self):
+        a = self.write_deck("a", "1,a,ஒன்று,onru,One,https://example.com/1.png\n")
+        b = self.write_deck("b", "1,b,இரண்டு,irandu,Two,https://example.com/2.png\n")
+        first = deck_lint.lint_decks([a, b], cache_path=self.cache)
+        self.assertEqual((first["checked"], first["cached"]), (2, 0))
+
+        self.write_deck("b", "1,b,இரண்டு,irandu,Two,\n")
+        with patch("deck_lint.lint_deck_file", wraps=deck_lint.lint_deck_file) as spy:
+            second = deck_lint.lint_decks([a, b], cache_path=self.cache)
+        self.assertEqual((second["checked"], second["cached"]), (1, 1))
+        spy.assert_called_once_with(b)
+        self.assertEqual(self.rules(second), ["image-missing"])
+
+    def test_cache_drops_deleted_decks(self):
+        a = self.write_deck("a", "1,a,ஒன்று,onru,One,https://example.com/1.png\n")
+        b = self.write_deck("b", "1,b,இரண்டு,irandu,Two,https://example.com/2.png\n")
+        with patch("deck_lint.DECKS_DIR", self.dir):
+            deck_lint.lint_decks(cache_path=self.cache)
+            self.assertEqual(len(deck_lint.load_cache(self.cache)), 2)
+            b.unlink()
+            report = deck_lint.lint_decks(cache_path=self.cache)
+        self.assertEqual((report["checked"], report["cached"]), (0, 1))
+        self.assertEqual(list(deck_lint.load_cache(self.cache)), [str(a.resolve())])
+        self.assertFalse(self.cache.with_suffix(".tmp").exists())
+
+    def test_main_exit_code(self):
+        path = self.write_deck("food", "1,food,water,water,Water,https://example.com/w.png\n")
+        with patch("deck_lint.LINT_CACHE_PATH", self.cache), patch("builtins.print"):
+            self.assertEqual(deck_lint.main(["--format", "json", str(path)]), 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import random
+import unittest
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+
+# This is a bit of a hack to import the distractors module from the parent directory
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+import distractors
+
+DECK = pd.DataFrame({
+    "id": [1, 2, 3, 4, 5, 6],
+    "category": ["greetings", "greetings", "greetings", "food", "food", "food"],
+    "tamil": ["வணக்கம்", "நன்றி", "நன்றி", "தண்ணீர்", "சோறு", "பால்"],
+    "translit": ["vanakkam", "nandri", "nandri", "thanneer", "soru", "paal"],
+    "english": ["Hello", "Thank you", "Thanks", "Water", "Rice", "Milk"],
+})
+
+class TestDistractors(unittest.TestCase):
+
+    def test_tamil_graphemes(self):
+        self.assertEqual(distractors.tamil_graphemes("நன்றி"), ("ந", "ன்", "றி"))
+
+    def test_edit_distance(self):
+        self.assertEqual(distractors.edit_distance("nandri", "nanri"), 1)
+        self.assertEqual(distractors.edit_distance("", "abc"), 3)
+
+    def test_build_table(self):
+        table = distractors.build_table(DECK)
+        # Same category ranks first; a card with the same Tamil is never offered.
+        self.assertEqual(table["near"][2][:1], [1])
+        self.assertNotIn(3, table["near"][2])
+        self.assertEqual(set(table["near"][4][:2]), {5, 6})
+
+    def test_pick(self):
+        table = distractors.build_table(DECK)
+        rng = random.Random(0)
+        picks = distractors.pick(table, 4, k=2, rng=rng)
+        self.assertEqual(len(picks), 2)
+        self.assertTrue(set(picks) <= set(table["near"][4][:4]))
+        picks = distractors.pick(table, 4, k=2, pool_ids={4, 5, 6}, rng=rng)
+        self.assertEqual(set(picks), {5, 6})
+        # Cards 2 and 3 share their Tamil, so only one of them can be an option.
+        picks = distractors.pick(table, 1, k=3, pool_ids={1, 2, 3}, rng=rng)
+        self.assertEqual(len(picks), 1)
+        self.assertIn(picks[0], (2, 3))
+
+    def test_pick_fallback_skips_same_text_cards(self):
+        table = distractors.build_table(DECK)
+        for seed in range(20):
+            picks = distractors.pick(table, 2, k=2, pool_ids={1, 2, 3}, rng=random.Random(seed))
+            self.assertEqual(picks, [1])
+
+    def test_table_cached_on_disk_per_deck_version(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            deck_path = root / "d.csv"
+            DECK.to_csv(deck_path, index=False)
+            with patch("helpers.DECKS_DIR", root), patch("distractors.DISTRACTORS_DIR", root / "cache"), \
+                 patch.dict(distractors._tables, clear=True), \
+                 patch("distractors.build_table", wraps=distractors.build_table) as build:
+                first = distractors.table_for("d")
+                distractors._tables.clear()
+                self.assertEqual(distractors.table_for("d"), first)
+                self.assertEqual(build.call_count, 1)
+
+                DECK.iloc[:4].to_csv(deck_path, index=False)
+                self.assertEqual(sorted(distractors.table_for("d")["near"]), [1, 2, 3, 4])
+                self.assertEqual(build.call_count, 2)
+                self.assertEqual([p.name for p in (root / "cache").iterdir()], ["d.json"])
+
+if __name__ == "__main__":
+    unittest.main()
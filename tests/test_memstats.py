@@ -0,0 +1,54 @@
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+
+# This is a bit of a hack to import the memstats module from the parent directory
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+import memstats
+
+class TestMemstats(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch.multiple(memstats, _sessions={}, _shared={})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_deep_sizeof(self):
+        small = memstats.deep_sizeof({"card_id": 3})
+        big = memstats.deep_sizeof({"card_id": 3, "options": ["x" * 1000]})
+        self.assertGreater(big - small, 1000)
+
+        df = pd.DataFrame({"tamil": ["வணக்கம்"] * 100})
+        self.assertEqual(memstats.deep_sizeof(df), int(df.memory_usage(deep=True).sum()))
+
+    def test_shared_objects_not_charged_to_sessions(self):
+        deck = pd.DataFrame({"english": ["Hello"] * 1000})
+        charged = memstats.deep_sizeof({"deck": deck})
+        memstats.record_shared("deck:core", deck)
+        self.assertLess(memstats.deep_sizeof({"deck": deck}), charged - 1000)
+        self.assertEqual(memstats.report()["shared"]["deck:core"], int(deck.memory_usage(deep=True).sum()))
+
+    def test_report_and_estimate(self):
+        memstats.record_session("a", {"score": 10, "quiz_option_ids": (1, 2, 3)}, label="You")
+        memstats.record_session("b", {"score": 0}, label="Shiv")
+        rep = memstats.report()
+        self.assertEqual(rep["sessions"], 2)
+        self.assertEqual(set(rep["per_session"]["a"]["keys"]), {"score", "quiz_option_ids"})
+        self.assertEqual(rep["session_bytes_total"], rep["per_session"]["a"]["bytes"] + rep["per_session"]["b"]["bytes"])
+        self.assertEqual(
+            memstats.estimate_rss(rep, 102) - memstats.estimate_rss(rep, 2),
+            100 * rep["session_bytes_avg"],
+        )
+
+    def test_stale_sessions_dropped(self):
+        with patch("memstats.time.time", return_value=1000.0):
+            memstats.record_session("old", {"score": 1})
+        with patch("memstats.time.time", return_value=1000.0 + memstats.SESSION_TTL + 1):
+            memstats.record_session("new", {"score": 1})
+        self.assertEqual(list(memstats.report()["per_session"]), ["new"])
+
+if __name__ == "__main__":
+    unittest.main()